@@ -1,8 +1,15 @@
 import json
 import asyncio
+import gzip
+import hashlib
+import os
 import re
+import time
+import zlib
 import aiohttp
-from typing import List, Dict, Optional
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Dict, Optional, Tuple
 
 # AstrBot 核心 API 导入
 from astrbot.api import logger, AstrBotConfig
@@ -10,6 +17,790 @@ from astrbot.api.event import filter, AstrMessageEvent
 from astrbot.api.star import Context, Star, register
 from astrbot.core.utils.session_waiter import session_waiter, SessionController
 
+# Brotli 为可选依赖，未安装时仅协商 gzip/deflate
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+
+class AutoSearchQueue:
+    """
+    自动搜索准入队列：有界等待队列 + 固定数量的工作协程。
+
+    队列满时按丢弃策略削减负载：
+        drop_oldest: 丢弃等待最久的请求
+        drop_newest: 丢弃新到达的请求
+        fair_share: 丢弃积压最多的群里最早的请求，避免单个群占满队列
+    """
+
+    POLICIES = ("drop_oldest", "drop_newest", "fair_share")
+
+    # 请求被丢弃时 Future 的结果，与处理失败（None）区分
+    SHED = object()
+
+    def __init__(
+        self,
+        handler: Callable[..., Awaitable[Any]],
+        maxsize: int = 20,
+        workers: int = 2,
+        policy: str = "drop_oldest",
+    ):
+        self._handler = handler
+        self.maxsize = max(1, int(maxsize))
+        self.worker_count = max(1, int(workers))
+        self.policy = policy if policy in self.POLICIES else "drop_oldest"
+        # 等待项: (group_id, args, future)
+        self._pending: deque = deque()
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+
+        # 统计数据，用于调整容量
+        self.accepted = 0
+        self.completed = 0
+        self.failed = 0
+        self.shed_total = 0
+        self.shed_by_group: Counter = Counter()
+
+    def submit(self, group_id: str, *args) -> asyncio.Future:
+        """
+        提交一个自动搜索任务
+
+        Returns:
+            Future，完成时为处理结果；被丢弃时为 SHED，处理异常时为 None
+        """
+        if not self._workers:
+            self._start()
+
+        future = asyncio.get_running_loop().create_future()
+        item = (group_id, args, future)
+
+        if len(self._pending) >= self.maxsize:
+            victim = self._choose_victim(group_id)
+            if victim is None:
+                self._shed(item)
+                return future
+            self._pending.remove(victim)
+            self._shed(victim)
+
+        self._pending.append(item)
+        self.accepted += 1
+        self._wakeup.set()
+        return future
+
+    def _choose_victim(self, group_id: str):
+        """根据丢弃策略选出要丢弃的等待项，返回 None 表示丢弃新请求"""
+        if self.policy == "drop_newest":
+            return None
+        if self.policy == "drop_oldest":
+            return self._pending[0]
+
+        # fair_share：找出积压最多的群，新请求所在群并列最多时丢弃新请求
+        backlog = Counter(g for g, _, _ in self._pending)
+        heaviest, heaviest_count = backlog.most_common(1)[0]
+        if backlog.get(group_id, 0) >= heaviest_count:
+            return None
+        for item in self._pending:
+            if item[0] == heaviest:
+                return item
+        return None
+
+    def _shed(self, item):
+        group_id, _, future = item
+        self.shed_total += 1
+        self.shed_by_group[group_id] += 1
+        if not future.done():
+            future.set_result(self.SHED)
+        logger.info(
+            f"TouchGal 自动搜索队列已满（{self.policy}），丢弃群 {group_id} 的请求 | 累计丢弃: {self.shed_total}"
+        )
+
+    def _start(self):
+        for _ in range(self.worker_count):
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    async def _worker(self):
+        while True:
+            while not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            _, args, future = self._pending.popleft()
+            if future.done():
+                continue
+
+            try:
+                result = await self._handler(*args)
+                self.completed += 1
+            except Exception as e:
+                logger.error(f"TouchGal 自动搜索任务异常: {e}")
+                self.failed += 1
+                result = None
+
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self):
+        """停止所有工作协程，并释放仍在等待的请求"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        while self._pending:
+            _, _, future = self._pending.popleft()
+            if not future.done():
+                future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "workers": self.worker_count,
+            "maxsize": self.maxsize,
+            "pending": len(self._pending),
+            "accepted": self.accepted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "shed_total": self.shed_total,
+            "shed_by_group": dict(self.shed_by_group.most_common(5)),
+        }
+
+
+def sanitize_text(text: str) -> str:
+    """
+    遮盖文本中的长数字串（QQ 号、手机号等）
+
+    以等长的 0 替换：保持为数字，关键词提取的字符清理不会将其删除；
+    重复遮盖结果不变，回放时对已遮盖文本再次计算请求键仍能匹配。
+    """
+    return re.sub(r"\d{6,}", lambda m: "0" * len(m.group(0)), text)
+
+
+def traffic_key(
+    method: str, url: str, params=None, data=None, sanitize: bool = False
+) -> str:
+    """
+    生成上游请求的唯一键
+
+    Args:
+        sanitize: 是否遮盖参数与请求体中的长数字串。录制与回放使用遮盖后的键，
+            与录制文件中遮盖过的消息和关键词保持一致
+    """
+    clean = sanitize_text if sanitize else str
+    key = f"{method} {url}"
+    if params:
+        key += "?" + "&".join(
+            f"{k}={clean(str(v))}" for k, v in sorted(params.items())
+        )
+    if data:
+        digest = hashlib.sha1(clean(str(data)).encode("utf-8")).hexdigest()
+        key += " " + digest[:12]
+    return key
+
+
+class TrafficRecorder:
+    """
+    流量录制器：将触发自动搜索的群消息、提取的关键词以及上游响应
+    以 gzip 压缩的 JSON Lines 格式追加写入文件，供 replay.py 离线回放。
+
+    群号做哈希处理，不记录发送者，消息中的长数字串（QQ 号、手机号等）会被遮盖。
+    """
+
+    def __init__(self, path: str, flush_every: int = 20):
+        self.path = path
+        self.flush_every = max(1, int(flush_every))
+        self._buffer: List[str] = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _hash_group(group_id: str) -> str:
+        return hashlib.sha1(str(group_id).encode("utf-8")).hexdigest()[:10]
+
+    def _write(self, record: dict):
+        record["ts"] = round(time.time(), 3)
+        self._buffer.append(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        )
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def record_message(self, group_id: str, message: str, keyword: str):
+        """记录一条触发自动搜索的群消息及其提取出的关键词"""
+        self._write(
+            {
+                "type": "message",
+                "group": self._hash_group(group_id),
+                "text": sanitize_text(message),
+                "keyword": sanitize_text(keyword),
+            }
+        )
+
+    def record_upstream(
+        self,
+        endpoint: str,
+        key: str,
+        status: Optional[int],
+        body: str,
+        elapsed: float,
+        error: Optional[str] = None,
+    ):
+        record = {
+            "type": "upstream",
+            "endpoint": endpoint,
+            "key": key,
+            "status": status,
+            "elapsed": round(elapsed, 4),
+            "body": body,
+        }
+        if error:
+            record["error"] = error
+        self._write(record)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        try:
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write("\n".join(self._buffer) + "\n")
+        except OSError as e:
+            logger.error(f"TouchGal 流量录制写入失败: {e}")
+        self._buffer.clear()
+
+
+class LatencyTracker:
+    """
+    按上游分别统计最近的响应耗时，据此推导自适应超时（p99 × 系数，限制在上下限之间）
+    以及对冲请求的触发时间（p95）。样本不足时使用超时上限。
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        factor: float = 2.0,
+        min_timeout: float = 2.0,
+        max_timeout: float = 10.0,
+    ):
+        self.window = max(1, int(window))
+        self.min_samples = max(1, int(min_samples))
+        self.factor = float(factor)
+        self.max_timeout = float(max_timeout)
+        self.min_timeout = min(float(min_timeout), self.max_timeout)
+        self._samples: Dict[str, deque] = {}
+
+        self.hedges_sent: Counter = Counter()
+        self.hedges_won: Counter = Counter()
+
+    def record(self, endpoint: str, elapsed: float):
+        if endpoint not in self._samples:
+            self._samples[endpoint] = deque(maxlen=self.window)
+        self._samples[endpoint].append(elapsed)
+
+    def percentile(self, endpoint: str, pct: float) -> Optional[float]:
+        """返回指定分位的耗时，样本不足时返回 None"""
+        samples = self._samples.get(endpoint)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def timeout(self, endpoint: str) -> float:
+        p99 = self.percentile(endpoint, 99)
+        if p99 is None:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.factor))
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        return self.percentile(endpoint, 95)
+
+    def stats(self) -> dict:
+        return {
+            endpoint: {
+                "samples": len(samples),
+                "p50": self.percentile(endpoint, 50),
+                "p95": self.percentile(endpoint, 95),
+                "p99": self.percentile(endpoint, 99),
+                "timeout": self.timeout(endpoint),
+                "hedges_sent": self.hedges_sent[endpoint],
+                "hedges_won": self.hedges_won[endpoint],
+            }
+            for endpoint, samples in self._samples.items()
+        }
+
+
+def decode_body(raw: bytes, content_encoding: str) -> bytes:
+    """按 Content-Encoding 解压响应体"""
+    encoding = (content_encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(raw)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            # 部分服务器返回不带 zlib 头的原始 deflate 数据
+            return zlib.decompress(raw, -zlib.MAX_WBITS)
+    if encoding == "br" and brotli:
+        return brotli.decompress(raw)
+    return raw
+
+
+class ConditionalCache:
+    """
+    上游响应的条件请求缓存：保存 ETag / Last-Modified 及响应内容，
+    重复请求时携带 If-None-Match / If-Modified-Since 重新验证，
+    上游返回 304 时直接使用本地副本。
+
+    同时统计实际传输字节数与提供给插件的字节数。
+    """
+
+    def __init__(self, max_entries: int = 100, enabled: bool = True):
+        self.max_entries = max(1, int(max_entries))
+        self.enabled = enabled
+        self._entries: OrderedDict = OrderedDict()
+
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_transferred = 0
+        self.bytes_served = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry:
+            self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[dict]) -> dict:
+        """根据缓存条目返回重新验证所需的条件请求头"""
+        if not entry:
+            return {}
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key: str, response_headers, body: str, size: int):
+        if not self.enabled:
+            return
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if not etag and not last_modified:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+            "size": size,
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def record_transfer(self, transferred: int, served: int, not_modified: bool):
+        self.requests += 1
+        self.bytes_transferred += transferred
+        self.bytes_served += served
+        if not_modified:
+            self.not_modified += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "bytes_transferred": self.bytes_transferred,
+            "bytes_served": self.bytes_served,
+        }
+
+
+class AliasIndex:
+    """
+    别名索引：记录用户在指令搜索中为每个（规范化后的）关键词实际选择的游戏，
+    之后相同关键词的搜索与自动搜索可直接定位到该游戏，跳过 /api/search 请求与翻页。
+
+    每次选择记 1 分，分数按半衰期随时间衰减；选择了其他游戏时旧映射分数减半，
+    直接定位后用户要求查看完整列表时该映射降到阈值以下。低于阈值的映射不再使用，
+    衰减殆尽或超出容量时被淘汰。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        half_life_days: float = 30.0,
+        max_entries: int = 2000,
+        min_score: float = 0.5,
+    ):
+        self.path = path
+        self.half_life = max(1.0, float(half_life_days)) * 86400
+        self.max_entries = max(1, int(max_entries))
+        self.min_score = float(min_score)
+        # {规范化关键词: {游戏 id: {"id", "uniqueId", "name", "hits", "ts"}}}
+        self._entries: Dict[str, Dict[str, dict]] = {}
+
+        self.lookups = 0
+        self.shortcuts = 0
+        self._load()
+
+    @staticmethod
+    def normalize(keyword: str) -> str:
+        """去除空白与标点并转为小写"""
+        return re.sub(r"[\W_]+", "", keyword or "").lower()
+
+    def _score(self, item: dict, now: float) -> float:
+        return item["hits"] * 0.5 ** ((now - item["ts"]) / self.half_life)
+
+    def lookup(self, keyword: str) -> Optional[dict]:
+        """
+        查找关键词对应的游戏
+
+        Returns:
+            {'id', 'uniqueId', 'name'}，无可用映射时返回 None
+        """
+        self.lookups += 1
+        candidates = self._entries.get(self.normalize(keyword))
+        if not candidates:
+            return None
+
+        now = time.time()
+        best = max(candidates.values(), key=lambda item: self._score(item, now))
+        if self._score(best, now) < self.min_score:
+            return None
+
+        self.shortcuts += 1
+        return {"id": best["id"], "uniqueId": best["uniqueId"], "name": best["name"]}
+
+    def record(self, keyword: str, game: dict):
+        """记录一次用户选择"""
+        key = self.normalize(keyword)
+        if not key or not game.get("id") or not game.get("uniqueId"):
+            return
+
+        now = time.time()
+        game_key = str(game["id"])
+        candidates = self._entries.setdefault(key, {})
+        for other_key, item in candidates.items():
+            # 先把分数折算到当前时间，选择了其他游戏时削弱旧映射
+            item["hits"] = self._score(item, now)
+            item["ts"] = now
+            if other_key != game_key:
+                item["hits"] /= 2
+
+        item = candidates.setdefault(
+            game_key,
+            {"id": game["id"], "uniqueId": game["uniqueId"], "hits": 0.0, "ts": now},
+        )
+        item["name"] = game.get("name", "")
+        item["hits"] += 1
+        self._prune(now)
+        self.save()
+
+    def reject(self, keyword: str, game: dict):
+        """
+        用户认为直接定位的结果不对，将该映射降到阈值以下，不再直接定位；
+        分数降为阈值的一半以下，用户之后在列表中再次选择该游戏即可恢复
+        """
+        item = self._entries.get(self.normalize(keyword), {}).get(str(game.get("id")))
+        if item:
+            now = time.time()
+            item["hits"] = min(self._score(item, now), self.min_score) / 2
+            item["ts"] = now
+            self._prune(now)
+            self.save()
+
+    def forget(self, keyword: str, game: dict):
+        """移除已失效的映射"""
+        key = self.normalize(keyword)
+        candidates = self._entries.get(key)
+        if candidates and candidates.pop(str(game.get("id")), None):
+            if not candidates:
+                del self._entries[key]
+            self.save()
+
+    def _prune(self, now: float):
+        """淘汰衰减殆尽的映射，超出容量时淘汰分数最低的关键词"""
+        for key in list(self._entries):
+            candidates = self._entries[key]
+            for game_key in list(candidates):
+                if self._score(candidates[game_key], now) < 0.05:
+                    del candidates[game_key]
+            if not candidates:
+                del self._entries[key]
+
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            ranked = sorted(
+                self._entries,
+                key=lambda k: max(
+                    self._score(item, now) for item in self._entries[k].values()
+                ),
+            )
+            for key in ranked[:overflow]:
+                del self._entries[key]
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f).get("entries", {})
+            self._prune(time.time())
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"TouchGal 别名索引读取失败: {e}")
+            self._entries = {}
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": 1, "entries": self._entries},
+                    f,
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"TouchGal 别名索引保存失败: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "keywords": len(self._entries),
+            "lookups": self.lookups,
+            "shortcuts": self.shortcuts,
+        }
+
+
+def load_traffic(path: str) -> List[dict]:
+    """读取 TrafficRecorder 录制的流量文件"""
+    records = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def parse_shionlib_html(html: str, domain: str, limit: int) -> List[dict]:
+    """
+    解析 Shionlib 搜索结果页，提取游戏列表
+
+    纯函数，不依赖插件状态，可在线程池或进程池中执行。
+    """
+    # 解析 HTML 提取游戏列表
+    # 匹配格式: <a href="/zh/game/708">...游戏名...</a>
+    game_pattern = r'<a[^>]*href="(/zh/game/(\d+))"[^>]*>'
+    matches = re.findall(game_pattern, html)
+
+    if not matches:
+        return []
+
+    # 提取游戏名称（查找游戏卡片中的标题）
+    # 更精确的匹配：查找包含游戏ID链接附近的标题
+    games = []
+    seen_ids = set()
+
+    for href, game_id in matches:
+        if game_id in seen_ids:
+            continue
+        seen_ids.add(game_id)
+
+        # 尝试提取游戏名称（查找链接后的文本或附近的 h3/p 标签）
+        # 简化方案：从 HTML 中匹配游戏名称
+        name_pattern = rf'href="{re.escape(href)}"[^>]*>\s*(?:<[^>]*>)*\s*([^<]+)'
+        name_match = re.search(name_pattern, html)
+        game_name = name_match.group(1).strip() if name_match else f"游戏 #{game_id}"
+
+        games.append(
+            {
+                "id": game_id,
+                "name": game_name,
+                "url": f"https://{domain}{href}",
+            }
+        )
+
+        if len(games) >= limit:
+            break
+
+    return games
+
+
+def extract_keyword(pattern: str, message: str) -> Optional[str]:
+    """
+    用正则从消息中提取搜索关键词并清理干扰词
+
+    纯函数，可在线程池或进程池中执行；正则无效时抛出 re.error。
+
+    Returns:
+        清理后的关键词；未匹配时返回 None
+    """
+    match = re.search(pattern, message)
+    if not match:
+        return None
+
+    # 提取并清理搜索关键词
+    keyword = match.group(1).strip()
+
+    # 清理干扰词，提取更精准的游戏名
+    cleanup_patterns = [
+        r"^(?:一个|一下|一份)\s*",  # 开头的量词
+        r"^(?:那个|这个|个)\s*",  # 开头的指示词
+        r"\s*(?:的资源|的游戏|资源|游戏|下载|链接|安装包|安卓|手机|手机端)$",  # 结尾的"资源"、"游戏"等
+        r"\s*(?:谢谢|感谢|蟹蟹|thx|thanks|thank you).*$",  # 结尾的感谢词
+        r"[！!？?，,。.~～、]+$",  # 结尾的标点符号
+        r"的$",  # 结尾的"的"
+    ]
+    for cleanup in cleanup_patterns:
+        keyword = re.sub(cleanup, "", keyword, flags=re.IGNORECASE).strip()
+
+    # 移除所有非有效字符（只保留中英文、数字、常见符号）
+    # 这会自动过滤掉所有emoji和特殊符号
+    keyword = re.sub(
+        r"[^\u4e00-\u9fff\u3040-\u30ff\w\s\-_./:;!?&+\'\"()（）【】《》]",
+        "",
+        keyword,
+    ).strip()
+
+    return keyword
+
+
+class OffloadExecutor:
+    """
+    CPU 密集型任务的执行器：输入超过阈值时交给线程池或进程池执行，
+    避免大页面解析、大 JSON 解码阻塞所有插件共用的事件循环；小输入直接在当前线程执行。
+
+    mode:
+        auto: 按任务类型选择，全程持有 GIL 的任务（JSON 解码、正则匹配）使用进程池，
+              其余任务（HTML 解析）使用线程池
+        inline: 始终在事件循环中执行
+        thread: 始终使用线程池；JSON 解码与正则匹配执行期间持有 GIL，
+                事件循环仍会被阻塞，几乎不能降低延迟
+        process: 始终使用进程池，真正并行，但需要序列化参数与结果
+    """
+
+    MODES = ("auto", "inline", "thread", "process")
+
+    def __init__(self, mode: str = "auto", workers: int = 2, threshold: int = 65536):
+        self.mode = mode if mode in self.MODES else "auto"
+        self.workers = max(1, int(workers))
+        self.threshold = max(0, int(threshold))
+        self._executors: Dict[str, Executor] = {}
+
+        self.inline_count = 0
+        # 按执行器类型（thread/process）统计交出的任务数
+        self.offloaded: Counter = Counter()
+
+    def _get_executor(self, kind: str) -> Executor:
+        executor = self._executors.get(kind)
+        if executor is None:
+            if kind == "process":
+                executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="touchgal"
+                )
+            self._executors[kind] = executor
+        return executor
+
+    async def run(
+        self,
+        size: int,
+        func: Callable,
+        *args,
+        threshold: Optional[int] = None,
+        holds_gil: bool = False,
+    ):
+        """
+        执行 func(*args)
+
+        Args:
+            size: 输入大小（字符数），用于与阈值比较
+            threshold: 覆盖默认阈值（如消息正则匹配使用更低的阈值）
+            holds_gil: 任务执行期间是否全程持有 GIL（JSON 解码、正则匹配），
+                auto 模式下此类任务交给进程池
+        """
+        if threshold is None:
+            threshold = self.threshold
+        if self.mode == "inline" or size < threshold:
+            self.inline_count += 1
+            return func(*args)
+
+        kind = self.mode
+        if kind == "auto":
+            kind = "process" if holds_gil else "thread"
+        self.offloaded[kind] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(kind), func, *args)
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "threshold": self.threshold,
+            "inline": self.inline_count,
+            "thread": self.offloaded["thread"],
+            "process": self.offloaded["process"],
+        }
+
+
+class LoopLagMonitor:
+    """
+    事件循环延迟监测：周期性休眠固定时长，实际唤醒时间与预期之差即为事件循环被阻塞的时长
+    """
+
+    def __init__(self, interval: float = 0.5, window: int = 240):
+        self.interval = interval
+        self._lags: deque = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self.max_lag = 0.0
+
+    def start(self):
+        """启动监测（可重复调用）"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        ordered = sorted(self._lags)
+        if not ordered:
+            return {"samples": 0}
+        return {
+            "samples": len(ordered),
+            "p50": ordered[len(ordered) // 2],
+            "p99": ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+            "max": self.max_lag,
+        }
+
 
 @register("touchgal_search", "AI Assistant", "从 TouchGal 搜索游戏资源", "1.0.0")
 class TouchGalPlugin(Star):
@@ -30,6 +821,68 @@ class TouchGalPlugin(Star):
         self.group_mode = self.config.get("auto_search_group_mode", "blacklist")
         self.group_list = self.config.get("auto_search_group_list", [])
 
+        # 自动搜索准入队列
+        self.auto_search_queue = AutoSearchQueue(
+            self._auto_search_lookup,
+            maxsize=self.config.get("auto_search_queue_size", 20),
+            workers=self.config.get("auto_search_workers", 2),
+            policy=self.config.get("auto_search_drop_policy", "drop_oldest"),
+        )
+
+        # 流量录制（可选），回放时由 replay.py 注入 traffic_replay
+        self.traffic_recorder: Optional[TrafficRecorder] = None
+        if self.config.get("traffic_record_enabled", False):
+            record_path = self.config.get("traffic_record_path", "") or os.path.join(
+                "data", "touchgal_traffic.jsonl.gz"
+            )
+            self.traffic_recorder = TrafficRecorder(record_path)
+            logger.info(f"TouchGal 流量录制已开启: {record_path}")
+        self.traffic_replay = None
+
+        # 自适应超时与对冲请求
+        self.latency = LatencyTracker(
+            factor=self.config.get("timeout_factor", 2.0),
+            min_timeout=self.config.get("timeout_min", 2.0),
+            max_timeout=self.config.get("timeout_max", 10.0),
+        )
+        self.connect_timeout = self.config.get("timeout_connect", 5.0)
+        self.read_timeout = self.config.get("timeout_read", 10.0)
+        self.hedge_enabled = self.config.get("hedge_enabled", False)
+
+        # CPU 密集型任务执行器与事件循环延迟监测
+        self.offload = OffloadExecutor(
+            mode=self.config.get("offload_mode", "auto"),
+            workers=self.config.get("offload_workers", 2),
+            threshold=self.config.get("offload_threshold", 65536),
+        )
+        # 消息正则匹配的输入远小于网页和 JSON，单独使用更低的阈值
+        self.offload_message_threshold = self.config.get(
+            "offload_message_threshold", 4096
+        )
+        self.loop_lag = LoopLagMonitor()
+        self.loop_lag_enabled = self.config.get("loop_lag_monitor", True)
+
+        # 从用户选择中学习的别名索引
+        self.alias_index: Optional[AliasIndex] = None
+        # 尚未结算的直接定位结果 {会话: (关键词, 游戏, 时间)}：
+        # /搜索列表 质疑时削弱映射，超过会话超时仍未被质疑时才计为一次选择
+        self._recent_shortcuts: OrderedDict = OrderedDict()
+        self._recent_shortcuts_limit = 256
+        if self.config.get("alias_index_enabled", True):
+            self.alias_index = AliasIndex(
+                self.config.get("alias_index_path", "")
+                or os.path.join("data", "touchgal_alias_index.json"),
+                half_life_days=self.config.get("alias_half_life_days", 30.0),
+                max_entries=self.config.get("alias_max_entries", 2000),
+                min_score=self.config.get("alias_min_score", 0.5),
+            )
+
+        # 条件请求缓存（ETag / Last-Modified）
+        self.http_cache = ConditionalCache(
+            max_entries=self.config.get("http_cache_size", 100),
+            enabled=self.config.get("http_cache_enabled", True),
+        )
+
         # 初始化日志
         auto_search = self.config.get("auto_search_enabled", False)
         logger.info(
@@ -40,6 +893,7 @@ class TouchGalPlugin(Star):
         """创建通用请求头"""
         headers = {
             "accept": "*/*",
+            "accept-encoding": ACCEPT_ENCODING,
             "accept-language": "zh-CN,zh;q=0.9",
             "content-type": "text/plain;charset=UTF-8",
             "origin": f"https://{self.domain}",
@@ -61,6 +915,176 @@ class TouchGalPlugin(Star):
 
         return headers
 
+    async def initialize(self):
+        """插件加载后启动事件循环延迟监测"""
+        if self.loop_lag_enabled:
+            self.loop_lag.start()
+
+    async def terminate(self):
+        """插件卸载时停止后台任务与执行器，并写出未保存的录制数据"""
+        await self.auto_search_queue.close()
+        await self.loop_lag.stop()
+        self._settle_shortcuts(force=True)
+        self.offload.shutdown()
+        if self.traffic_recorder:
+            self.traffic_recorder.flush()
+
+    async def _fetch(
+        self, endpoint: str, method: str, url: str, **kwargs
+    ) -> Tuple[int, str]:
+        """
+        统一的上游请求入口，负责压缩协商、条件请求缓存、录制与回放
+
+        Args:
+            endpoint: 上游标识（touchgal_search / touchgal_resource / shionlib）
+            method: HTTP 方法
+            url: 请求地址
+            **kwargs: 透传给 aiohttp 的参数（params、data、headers 等）
+
+        Returns:
+            (状态码, 响应文本)；超时等网络异常直接抛出，由调用方处理
+        """
+        params, data = kwargs.get("params"), kwargs.get("data")
+        key = traffic_key(method, url, params, data)
+        # 录制与回放使用遮盖后的键，避免原始号码写入录制文件
+        record_key = traffic_key(method, url, params, data, sanitize=True)
+        if self.traffic_replay:
+            return await self.traffic_replay.respond(endpoint, record_key)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        # 条件请求仅用于 GET/HEAD（其他方法的 If-None-Match 命中时应返回 412）；
+        # 请求前取出缓存快照，避免等待响应期间条目被淘汰
+        conditional = method.upper() in ("GET", "HEAD")
+        cached = self.http_cache.get(key) if conditional else None
+        headers.update(self.http_cache.conditional_headers(cached))
+
+        timeout = self.latency.timeout(endpoint)
+        client_timeout = aiohttp.ClientTimeout(
+            total=timeout,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+
+        start = time.monotonic()
+        try:
+            # 整体限制在 timeout 内，对冲请求不会把总耗时延长到 p95 + timeout
+            status, raw, response_headers, charset, elapsed = await asyncio.wait_for(
+                self._request_hedged(
+                    endpoint, method, url, headers, client_timeout, kwargs
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            # 超时按超时时长计入，使上游变慢时超时随之放宽
+            self.latency.record(endpoint, timeout)
+            if self.traffic_recorder:
+                self.traffic_recorder.record_upstream(
+                    endpoint,
+                    record_key,
+                    None,
+                    "",
+                    time.monotonic() - start,
+                    "timeout",
+                )
+            raise
+        self.latency.record(endpoint, elapsed)
+
+        not_modified = status == 304 and cached is not None
+        if not_modified:
+            # 内容未变化，使用本地副本
+            status, body, size = 200, cached["body"], cached["size"]
+        else:
+            data = decode_body(raw, response_headers.get("Content-Encoding", ""))
+            body = data.decode(charset or "utf-8", "replace")
+            size = len(data)
+            if status == 200 and conditional:
+                self.http_cache.store(key, response_headers, body, size)
+        self.http_cache.record_transfer(len(raw), size, not_modified)
+
+        if self.traffic_recorder:
+            self.traffic_recorder.record_upstream(
+                endpoint, record_key, status, body, time.monotonic() - start
+            )
+        return status, body
+
+    async def _request_hedged(
+        self,
+        endpoint: str,
+        method: str,
+        url: str,
+        headers: dict,
+        timeout: aiohttp.ClientTimeout,
+        kwargs: dict,
+    ):
+        """
+        发送上游请求；启用对冲时，若超过该上游的 p95 耗时仍未返回，
+        则再发送一个相同的请求，使用先成功返回的结果
+        """
+        hedge_delay = None
+        if self.hedge_enabled:
+            hedge_delay = self.latency.hedge_delay(endpoint)
+        if hedge_delay is None:
+            return await self._request_once(method, url, headers, timeout, kwargs)
+
+        primary = asyncio.ensure_future(
+            self._request_once(method, url, headers, timeout, kwargs)
+        )
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if done:
+                return primary.result()
+
+            self.latency.hedges_sent[endpoint] += 1
+            hedge = asyncio.ensure_future(
+                self._request_once(method, url, headers, timeout, kwargs)
+            )
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.latency.hedges_won[endpoint] += 1
+                        return task.result()
+
+            # 两个请求都失败，抛出主请求的异常
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request_once(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        timeout: aiohttp.ClientTimeout,
+        kwargs: dict,
+    ):
+        """
+        执行一次上游请求
+
+        Returns:
+            (状态码, 原始响应体, 响应头, 字符集, 耗时)
+        """
+        start = time.monotonic()
+        # 关闭自动解压，以便统计实际传输的字节数
+        async with aiohttp.ClientSession(auto_decompress=False) as session:
+            async with session.request(
+                method, url, headers=headers, timeout=timeout, **kwargs
+            ) as response:
+                raw = await response.read()
+                return (
+                    response.status,
+                    raw,
+                    response.headers,
+                    response.charset,
+                    time.monotonic() - start,
+                )
+
     async def search_games_async(
         self, keyword: str, page: int = 1, limit: int = 10
     ) -> List[dict]:
@@ -87,24 +1111,24 @@ class TouchGalPlugin(Star):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    search_url,
-                    data=json.dumps(payload),
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(
-                            f"TouchGal search failed with status: {response.status}"
-                        )
-                        return []
-                    search_results = await response.json()
-                    return (
-                        search_results.get("galgames", [])
-                        if isinstance(search_results, dict)
-                        else []
-                    )
+            status, body = await self._fetch(
+                "touchgal_search",
+                "POST",
+                search_url,
+                data=json.dumps(payload),
+                headers=self.headers,
+            )
+            if status != 200:
+                logger.warning(f"TouchGal search failed with status: {status}")
+                return []
+            search_results = await self.offload.run(
+                len(body), json.loads, body, holds_gil=True
+            )
+            return (
+                search_results.get("galgames", [])
+                if isinstance(search_results, dict)
+                else []
+            )
         except asyncio.TimeoutError:
             logger.error("TouchGal search timeout")
             return []
@@ -114,34 +1138,110 @@ class TouchGalPlugin(Star):
 
     async def get_links_async(self, game_info: dict) -> List[dict]:
         """异步获取下载链接（使用 aiohttp）"""
+        _, resources = await self._fetch_links(game_info)
+        return resources
+
+    async def _fetch_links(self, game_info: dict) -> Tuple[Optional[int], List[dict]]:
+        """
+        获取下载链接，同时返回上游状态码，用于区分游戏已不存在与临时故障
+
+        Returns:
+            (状态码, 资源列表)；超时或请求异常时状态码为 None
+        """
         patch_id = game_info.get("id")
         unique_id = game_info.get("uniqueId")
         if not patch_id or not unique_id:
-            return []
+            return None, []
 
         resource_url = f"https://{self.domain}/api/patch/resource?patchId={patch_id}"
         headers = self.headers.copy()
         headers["referer"] = f"https://{self.domain}/{unique_id}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    resource_url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(
-                            f"TouchGal get links failed with status: {response.status}"
-                        )
-                        return []
-                    return await response.json()
+            status, body = await self._fetch(
+                "touchgal_resource", "GET", resource_url, headers=headers
+            )
+            if status != 200:
+                logger.warning(f"TouchGal get links failed with status: {status}")
+                return status, []
+            return status, await self.offload.run(
+                len(body), json.loads, body, holds_gil=True
+            )
         except asyncio.TimeoutError:
             logger.error("TouchGal get links timeout")
-            return []
+            return None, []
         except Exception as e:
             logger.error(f"TouchGal get links failed: {e}")
-            return []
+            return None, []
+
+    async def _get_alias_resources(self, keyword: str, game: dict) -> List[dict]:
+        """
+        获取别名索引中游戏的资源
+
+        仅在确认游戏已不存在（404，或 200 但资源为空）时移除映射；
+        超时等临时故障保留映射，由调用方回退到正常搜索
+        """
+        status, resources = await self._fetch_links(game)
+        if not resources and status in (200, 404):
+            self.alias_index.forget(keyword, game)
+        return resources
+
+    async def _try_alias_shortcut(self, event: AstrMessageEvent, keyword: str) -> bool:
+        """
+        别名索引命中时直接发送历史选择的游戏资源，不进入搜索会话
+
+        Returns:
+            True 如果已直接发送，False 需要走正常搜索
+        """
+        if not self.alias_index:
+            return False
+        self._settle_shortcuts()
+        known_game = self.alias_index.lookup(keyword)
+        if not known_game:
+            return False
+        resources = await self._get_alias_resources(keyword, known_game)
+        if not resources:
+            return False
+
+        await event.send(
+            event.plain_result(
+                f"已根据历史选择直接定位到: {known_game.get('name')}\n若不是您要找的游戏，请发送 /搜索列表 {keyword} 查看完整搜索结果。"
+            )
+        )
+        await self._send_game_resources(event, known_game, resources)
+
+        # 暂不计分：会话超时内未发送 /搜索列表 才视为接受，见 _settle_shortcuts
+        session_id = event.unified_msg_origin
+        previous = self._recent_shortcuts.pop(session_id, None)
+        if previous:
+            # 同一会话已开始新的搜索，上一次直接定位未被质疑
+            self.alias_index.record(previous[0], previous[1])
+        self._recent_shortcuts[session_id] = (keyword, known_game, time.monotonic())
+        self._settle_shortcuts()
+        return True
+
+    def _settle_shortcuts(self, force: bool = False):
+        """
+        结算未被质疑的直接定位：超过会话超时仍未发送 /搜索列表 的计为一次选择，
+        使常用映射不会因衰减而失效；超出容量时提前结算最早的记录
+
+        Args:
+            force: 立即结算全部记录（插件卸载时）
+        """
+        if not self.alias_index:
+            self._recent_shortcuts.clear()
+            return
+        now = time.monotonic()
+        while self._recent_shortcuts:
+            session_id, (keyword, game, ts) = next(iter(self._recent_shortcuts.items()))
+            if (
+                not force
+                and now - ts < self.session_timeout
+                and len(self._recent_shortcuts) <= self._recent_shortcuts_limit
+            ):
+                break
+            del self._recent_shortcuts[session_id]
+            self.alias_index.record(keyword, game)
 
     async def search_shionlib_async(self, keyword: str, limit: int = 5) -> List[dict]:
         """
@@ -159,69 +1259,28 @@ class TouchGalPlugin(Star):
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Accept-Language": "zh-CN,zh;q=0.9",
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    search_url,
-                    params=params,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(
-                            f"Shionlib 搜索请求失败，状态码: {response.status}"
-                        )
-                        return []
-
-                    html = await response.text()
-
-                    # 解析 HTML 提取游戏列表
-                    # 匹配格式: <a href="/zh/game/708">...游戏名...</a>
-                    game_pattern = r'<a[^>]*href="(/zh/game/(\d+))"[^>]*>'
-                    matches = re.findall(game_pattern, html)
-
-                    if not matches:
-                        logger.debug(f"Shionlib 未找到游戏结果: {keyword}")
-                        return []
-
-                    # 提取游戏名称（查找游戏卡片中的标题）
-                    # 更精确的匹配：查找包含游戏ID链接附近的标题
-                    games = []
-                    seen_ids = set()
-
-                    for href, game_id in matches:
-                        if game_id in seen_ids:
-                            continue
-                        seen_ids.add(game_id)
-
-                        # 尝试提取游戏名称（查找链接后的文本或附近的 h3/p 标签）
-                        # 简化方案：从 HTML 中匹配游戏名称
-                        name_pattern = (
-                            rf'href="{re.escape(href)}"[^>]*>\s*(?:<[^>]*>)*\s*([^<]+)'
-                        )
-                        name_match = re.search(name_pattern, html)
-                        game_name = (
-                            name_match.group(1).strip()
-                            if name_match
-                            else f"游戏 #{game_id}"
-                        )
-
-                        games.append(
-                            {
-                                "id": game_id,
-                                "name": game_name,
-                                "url": f"https://{self.shionlib_domain}{href}",
-                            }
-                        )
+            status, html = await self._fetch(
+                "shionlib", "GET", search_url, params=params, headers=headers
+            )
+            if status != 200:
+                logger.warning(f"Shionlib 搜索请求失败，状态码: {status}")
+                return []
 
-                        if len(games) >= limit:
-                            break
+            # 解析 HTML 提取游戏列表（大页面交由执行器处理）
+            games = await self.offload.run(
+                len(html), parse_shionlib_html, html, self.shionlib_domain, limit
+            )
+            if not games:
+                logger.debug(f"Shionlib 未找到游戏结果: {keyword}")
+                return []
 
-                    logger.debug(f"Shionlib 搜索到 {len(games)} 个结果: {keyword}")
-                    return games
+            logger.debug(f"Shionlib 搜索到 {len(games)} 个结果: {keyword}")
+            return games
 
         except asyncio.TimeoutError:
             logger.warning(f"Shionlib 搜索超时: {keyword}")
@@ -238,6 +1297,38 @@ class TouchGalPlugin(Star):
         用法:
             /搜索 <游戏名称>
         """
+        # 别名索引命中：直接返回历史选择的游戏资源，跳过搜索与翻页
+        if await self._try_alias_shortcut(event, keyword):
+            event.stop_event()
+            return
+
+        async for result in self._search_session(event, keyword):
+            yield result
+
+    @filter.command("搜索列表")
+    async def search_list_command(self, event: AstrMessageEvent, keyword: str):
+        """
+        不使用别名索引，列出完整的搜索结果。
+
+        用法:
+            /搜索列表 <游戏名称>
+        """
+        # 刚刚直接定位过同一关键词，说明结果不对，不再使用该映射
+        self._settle_shortcuts()
+        recent = self._recent_shortcuts.get(event.unified_msg_origin)
+        if (
+            recent
+            and self.alias_index
+            and AliasIndex.normalize(recent[0]) == AliasIndex.normalize(keyword)
+        ):
+            del self._recent_shortcuts[event.unified_msg_origin]
+            self.alias_index.reject(recent[0], recent[1])
+
+        async for result in self._search_session(event, keyword):
+            yield result
+
+    async def _search_session(self, event: AstrMessageEvent, keyword: str):
+        """列出搜索结果并进入选择会话（翻页、选择、切换关键词）"""
         session_id = event.unified_msg_origin
         if session_id in self.active_sessions:
             try:
@@ -281,11 +1372,9 @@ class TouchGalPlugin(Star):
                         )
                     else:
                         session_state["current_games"] = new_games
-                        response_text = "--- 请选择 ---\n"
-                        for idx, game in enumerate(new_games):
-                            response_text += f"  {idx + 1}. {game.get('name')}\n"
-                        response_text += "-------\n请输入序号选择，'p' 下一页，'q' 上一页，'e' 退出搜索。\n提示：在退出前，您无法与机器人进行普通对话。"
-                        await event.send(event.plain_result(response_text))
+                        await event.send(
+                            event.plain_result(self._format_game_list(new_games))
+                        )
 
                     controller.keep(timeout=self.session_timeout, reset_timeout=True)
                     return
@@ -317,11 +1406,9 @@ class TouchGalPlugin(Star):
                     session_state["page"] -= 1
                 else:
                     session_state["current_games"] = new_games
-                    response_text = "--- 请选择 ---\n"
-                    for idx, game in enumerate(new_games):
-                        response_text += f"  {idx + 1}. {game.get('name')}\n"
-                    response_text += "-------\n请输入序号选择，'p' 下一页，'q' 上一页，'e' 退出搜索。\n提示：在退出前，您无法与机器人进行普通对话。"
-                    await event.send(event.plain_result(response_text))
+                    await event.send(
+                        event.plain_result(self._format_game_list(new_games))
+                    )
 
                 controller.keep(timeout=self.session_timeout, reset_timeout=True)
 
@@ -349,33 +1436,14 @@ class TouchGalPlugin(Star):
                                 event.plain_result("未能获取到该游戏的资源链接。")
                             )
                         else:
-                            # 并行搜索 Shionlib
-                            shionlib_games = []
-                            if self.shionlib_enabled:
-                                shionlib_games = await self.search_shionlib_async(
-                                    selected_game.get("name", ""),
-                                    limit=self.shionlib_limit,
-                                )
-
-                            # 智能选择发送方式
-                            if self._is_forward_supported(event):
-                                # QQ 平台：使用合并转发消息
-                                bot_uin = event.get_self_id()
-                                nodes = self._build_forward_nodes(
-                                    selected_game.get("name", "未知游戏"),
-                                    resources,
-                                    bot_uin,
-                                    shionlib_games,
+                            # 记录用户的选择，供别名索引学习
+                            if self.alias_index:
+                                self.alias_index.record(
+                                    session_state["keyword"], selected_game
                                 )
-                                await event.send(event.chain_result(nodes))
-                            else:
-                                # 其他平台：发送单条消息
-                                message_text = self._build_single_message(
-                                    selected_game.get("name", "未知游戏"),
-                                    resources,
-                                    shionlib_games,
-                                )
-                                await event.send(event.plain_result(message_text))
+                            await self._send_game_resources(
+                                event, selected_game, resources
+                            )
 
                         controller.stop()
                     else:
@@ -401,11 +1469,7 @@ class TouchGalPlugin(Star):
                 return
 
             session_state["current_games"] = initial_games
-            response_text = "--- 请选择 ---\n"
-            for idx, game in enumerate(initial_games):
-                response_text += f"  {idx + 1}. {game.get('name')}\n"
-            response_text += "-------\n请输入序号选择，'p' 下一页，'q' 上一页，'e' 退出搜索。\n提示：在退出前，您无法与机器人进行普通对话。"
-            yield event.plain_result(response_text)
+            yield event.plain_result(self._format_game_list(initial_games))
 
             await search_session_waiter(event)
 
@@ -419,6 +1483,95 @@ class TouchGalPlugin(Star):
                 del self.active_sessions[session_id]
             event.stop_event()
 
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command("搜索统计")
+    async def stats_command(self, event: AstrMessageEvent):
+        """
+        查看自动搜索等运行统计，用于调整容量配置（仅管理员可用）。
+
+        用法:
+            /搜索统计
+        """
+        queue_stats = self.auto_search_queue.stats()
+        cache_stats = self.http_cache.stats()
+        lines = [
+            "📊 TouchGal 运行统计",
+            "━━━━━━━━━━",
+            f"🚦 自动搜索队列 ({queue_stats['policy']})",
+            f"工作协程: {queue_stats['workers']} | 队列容量: {queue_stats['maxsize']} | 等待中: {queue_stats['pending']}",
+            f"已接收: {queue_stats['accepted']} | 已完成: {queue_stats['completed']} | 失败: {queue_stats['failed']} | 已丢弃: {queue_stats['shed_total']}",
+        ]
+        for group_id, count in queue_stats["shed_by_group"].items():
+            lines.append(f"  · {group_id}: 丢弃 {count}")
+        lines += [
+            f"🌐 上游请求 ({'缓存已启用' if cache_stats['enabled'] else '缓存未启用'})",
+            f"请求数: {cache_stats['requests']} | 304 命中: {cache_stats['not_modified']} | 缓存条目: {cache_stats['entries']}",
+            f"传输: {cache_stats['bytes_transferred'] / 1024:.1f} KB | 提供: {cache_stats['bytes_served'] / 1024:.1f} KB",
+        ]
+        for endpoint, item in self.latency.stats().items():
+            if item["p50"] is None:
+                lines.append(f"⏱ {endpoint}: 样本 {item['samples']}，不足以估算")
+                continue
+            lines.append(
+                f"⏱ {endpoint}: p50 {item['p50']:.2f}s | p95 {item['p95']:.2f}s | p99 {item['p99']:.2f}s | 超时 {item['timeout']:.1f}s | 对冲 {item['hedges_won']}/{item['hedges_sent']}"
+            )
+
+        if self.alias_index:
+            alias_stats = self.alias_index.stats()
+            lines.append(
+                f"🔖 别名索引: {alias_stats['keywords']} 个关键词 | 查询 {alias_stats['lookups']} | 直接定位 {alias_stats['shortcuts']}"
+            )
+
+        offload_stats = self.offload.stats()
+        lines.append(
+            f"⚙️ 执行器 ({offload_stats['mode']}, 阈值 {offload_stats['threshold']}/{self.offload_message_threshold}): 线程池 {offload_stats['thread']} | 进程池 {offload_stats['process']} | 直接执行 {offload_stats['inline']}"
+        )
+        lag_stats = self.loop_lag.stats()
+        if lag_stats["samples"]:
+            lines.append(
+                f"🔁 事件循环延迟: p50 {lag_stats['p50'] * 1000:.1f}ms | p99 {lag_stats['p99'] * 1000:.1f}ms | 最大 {lag_stats['max'] * 1000:.1f}ms"
+            )
+        yield event.plain_result("\n".join(lines))
+
+    def _format_game_list(self, games: List[dict]) -> str:
+        """构建搜索结果选择列表"""
+        response_text = "--- 请选择 ---\n"
+        for idx, game in enumerate(games):
+            response_text += f"  {idx + 1}. {game.get('name')}\n"
+        response_text += "-------\n请输入序号选择，'p' 下一页，'q' 上一页，'e' 退出搜索。\n提示：在退出前，您无法与机器人进行普通对话。"
+        return response_text
+
+    async def _send_game_resources(
+        self, event: AstrMessageEvent, game: dict, resources: List[dict]
+    ):
+        """搜索 Shionlib 推荐并发送游戏资源"""
+        shionlib_games = []
+        if self.shionlib_enabled:
+            shionlib_games = await self.search_shionlib_async(
+                game.get("name", ""),
+                limit=self.shionlib_limit,
+            )
+
+        # 智能选择发送方式
+        if self._is_forward_supported(event):
+            # QQ 平台：使用合并转发消息
+            bot_uin = event.get_self_id()
+            nodes = self._build_forward_nodes(
+                game.get("name", "未知游戏"),
+                resources,
+                bot_uin,
+                shionlib_games,
+            )
+            await event.send(event.chain_result(nodes))
+        else:
+            # 其他平台：发送单条消息
+            message_text = self._build_single_message(
+                game.get("name", "未知游戏"),
+                resources,
+                shionlib_games,
+            )
+            await event.send(event.plain_result(message_text))
+
     def _build_forward_nodes(
         self,
         game_name: str,
@@ -615,6 +1768,11 @@ class TouchGalPlugin(Star):
         except Exception:
             return False
 
+    def _get_group_id(self, event: AstrMessageEvent) -> Optional[str]:
+        """获取消息所在群号，无法获取时返回 None"""
+        group_id = getattr(event.message_obj, "group_id", None)
+        return str(group_id) if group_id else None
+
     def _should_process_group(self, event: AstrMessageEvent) -> bool:
         """
         检查当前群聊是否应该处理自动搜索
@@ -627,11 +1785,10 @@ class TouchGalPlugin(Star):
             return True
 
         # 获取群号
-        group_id = getattr(event.message_obj, "group_id", None)
-        if not group_id:
+        group_id_str = self._get_group_id(event)
+        if not group_id_str:
             return True  # 无法获取群号时默认处理
 
-        group_id_str = str(group_id)
         in_list = group_id_str in [str(g) for g in self.group_list]
 
         if self.group_mode == "whitelist":
@@ -639,6 +1796,40 @@ class TouchGalPlugin(Star):
         else:
             return not in_list  # 黑名单：不在列表中才处理
 
+    async def _extract_keyword(self, message: str) -> Optional[str]:
+        """
+        通过正则匹配从群消息中提取并清理搜索关键词，长消息交由执行器处理
+
+        Returns:
+            清理后的关键词；未匹配或正则无效时返回 None
+        """
+        # 获取正则匹配模式（从配置读取）
+        pattern = self.config.get("auto_search_pattern", "")
+
+        # 空模式检查
+        if not pattern:
+            logger.warning("TouchGal 自动搜索正则模式为空，跳过处理")
+            return None
+
+        try:
+            keyword = await self.offload.run(
+                len(message),
+                extract_keyword,
+                pattern,
+                message,
+                threshold=self.offload_message_threshold,
+                holds_gil=True,
+            )
+        except re.error as e:
+            logger.error(f"TouchGal 自动搜索正则表达式错误: {e}")
+            return None
+
+        if keyword is None:
+            logger.debug(f"TouchGal 消息未匹配正则模式")
+        else:
+            logger.debug(f"TouchGal 正则匹配成功，提取关键词: {keyword}")
+        return keyword
+
     @filter.event_message_type(filter.EventMessageType.GROUP_MESSAGE)
     async def auto_search_handler(self, event: AstrMessageEvent):
         """
@@ -665,50 +1856,19 @@ class TouchGalPlugin(Star):
         # 获取配置
         silent_mode = self.config.get("auto_search_silent", True)
 
-        # 获取正则匹配模式（从配置读取）
-        pattern = self.config.get("auto_search_pattern", "")
-
-        # 空模式检查
-        if not pattern:
-            logger.warning("TouchGal 自动搜索正则模式为空，跳过处理")
-            return
-
-        try:
-            match = re.search(pattern, message)
-        except re.error as e:
-            logger.error(f"TouchGal 自动搜索正则表达式错误: {e}")
+        keyword = await self._extract_keyword(message)
+        # 记录提取结果，供回放工具对比关键词变化
+        event.set_extra("touchgal_keyword", keyword)
+        if keyword is None:
             return
 
-        if not match:
-            logger.debug(f"TouchGal 消息未匹配正则模式")
-            return
-
-        logger.debug(
-            f"TouchGal 正则匹配成功，捕获内容: {match.group(1) if match.lastindex else '无捕获组'}"
-        )
-
-        # 提取并清理搜索关键词
-        keyword = match.group(1).strip()
-
-        # 清理干扰词，提取更精准的游戏名
-        cleanup_patterns = [
-            r"^(?:一个|一下|一份)\s*",  # 开头的量词
-            r"^(?:那个|这个|个)\s*",  # 开头的指示词
-            r"\s*(?:的资源|的游戏|资源|游戏|下载|链接|安装包|安卓|手机|手机端)$",  # 结尾的"资源"、"游戏"等
-            r"\s*(?:谢谢|感谢|蟹蟹|thx|thanks|thank you).*$",  # 结尾的感谢词
-            r"[！!？?，,。.~～、]+$",  # 结尾的标点符号
-            r"的$",  # 结尾的"的"
-        ]
-        for cleanup in cleanup_patterns:
-            keyword = re.sub(cleanup, "", keyword, flags=re.IGNORECASE).strip()
-
-        # 移除所有非有效字符（只保留中英文、数字、常见符号）
-        # 这会自动过滤掉所有emoji和特殊符号
-        keyword = re.sub(
-            r"[^\u4e00-\u9fff\u3040-\u30ff\w\s\-_./:;!?&+\'\"()（）【】《》]",
-            "",
-            keyword,
-        ).strip()
+        # 录制触发消息及提取结果（关键词过短时也记录，便于回放对比正则效果）
+        if self.traffic_recorder:
+            self.traffic_recorder.record_message(
+                self._get_group_id(event) or event.unified_msg_origin,
+                message,
+                keyword,
+            )
 
         if not keyword or len(keyword) < 2:
             return  # 关键词太短，忽略
@@ -719,43 +1879,29 @@ class TouchGalPlugin(Star):
         if not silent_mode:
             yield event.plain_result(f"🔍 检测到资源请求，正在搜索「{keyword}」...")
 
-        # 获取推荐数量配置
-        suggest_limit = self.config.get("auto_search_suggest_limit", 5)
-
-        # 同时搜索 TouchGal 和 Shionlib（利用书音的模糊搜索）
-        games = await self.search_games_async(keyword, page=1, limit=suggest_limit)
-
-        # 检查自动搜索时是否开启书音搜索
-        auto_search_shionlib = self.config.get("auto_search_shionlib", True)
-        shionlib_games = []
-        if self.shionlib_enabled and auto_search_shionlib:
-            shionlib_games = await self.search_shionlib_async(
-                keyword, limit=self.shionlib_limit
-            )
+        # 提交到准入队列，由固定数量的工作协程执行搜索
+        group_id = self._get_group_id(event) or event.unified_msg_origin
+        result = await self.auto_search_queue.submit(
+            group_id, event, keyword, silent_mode
+        )
 
-        # 如果两边都没搜到，静默返回
-        if not games and not shionlib_games:
+        # 被准入队列丢弃
+        if result is AutoSearchQueue.SHED:
+            if not silent_mode:
+                yield event.plain_result("⏳ 当前搜索请求过多，请稍后再试。")
             return
 
-        # 准备数据
-        game_name = None
-        resources = []
-        touchgal_suggestions = None
-
-        # TouchGal 有结果
-        if games:
-            first_game = games[0]
-            game_name = first_game.get("name", "未知游戏")
-            touchgal_suggestions = games if len(games) > 1 else None
-
-            # 非静默模式：发送进度提示
+        # 处理异常（已在队列中记录日志）或插件卸载
+        if result is None:
             if not silent_mode:
-                yield event.plain_result(
-                    f"✅ 找到游戏「{game_name}」，正在获取资源链接..."
-                )
+                yield event.plain_result("😔 搜索时发生错误，请稍后再试。")
+            return
 
-            # 获取资源链接
-            resources = await self.get_links_async(first_game)
+        game_name, resources, shionlib_games, touchgal_suggestions = result
+
+        # 如果两边都没搜到，静默返回
+        if not game_name and not shionlib_games:
+            return
 
         # 如果 TouchGal 没有资源但书音有结果，也发送
         if not resources and not shionlib_games:
@@ -780,3 +1926,58 @@ class TouchGalPlugin(Star):
             yield event.plain_result(message_text)
 
         event.stop_event()
+
+    async def _auto_search_lookup(
+        self, event: AstrMessageEvent, keyword: str, silent_mode: bool
+    ):
+        """
+        自动搜索的实际查询流程（在准入队列的工作协程中执行）
+
+        Returns:
+            (game_name, resources, shionlib_games, touchgal_suggestions)
+        """
+        # 检查自动搜索时是否开启书音搜索
+        auto_search_shionlib = self.config.get("auto_search_shionlib", True)
+        shionlib_games = []
+        if self.shionlib_enabled and auto_search_shionlib:
+            shionlib_games = await self.search_shionlib_async(
+                keyword, limit=self.shionlib_limit
+            )
+
+        # 别名索引命中：直接获取历史选择的游戏资源，跳过 TouchGal 搜索
+        # 自动搜索没有用户确认，命中不计入选择，映射只由 /搜索 的使用来刷新
+        known_game = self.alias_index.lookup(keyword) if self.alias_index else None
+        if known_game:
+            resources = await self._get_alias_resources(keyword, known_game)
+            if resources:
+                return known_game.get("name"), resources, shionlib_games, None
+
+        # 获取推荐数量配置
+        suggest_limit = self.config.get("auto_search_suggest_limit", 5)
+
+        # 搜索 TouchGal（书音已在上方利用其模糊搜索完成）
+        games = await self.search_games_async(keyword, page=1, limit=suggest_limit)
+
+        # 准备数据
+        game_name = None
+        resources = []
+        touchgal_suggestions = None
+
+        # TouchGal 有结果
+        if games:
+            first_game = games[0]
+            game_name = first_game.get("name", "未知游戏")
+            touchgal_suggestions = games if len(games) > 1 else None
+
+            # 非静默模式：发送进度提示
+            if not silent_mode:
+                await event.send(
+                    event.plain_result(
+                        f"✅ 找到游戏「{game_name}」，正在获取资源链接..."
+                    )
+                )
+
+            # 获取资源链接
+            resources = await self.get_links_async(first_game)
+
+        return game_name, resources, shionlib_games, touchgal_suggestions
@@ -0,0 +1,211 @@
+"""
+TouchGal 流量回放工具
+
+将 TrafficRecorder 录制的流量文件离线回放到插件中：群消息按原始时间间隔
+（或加速后）送入 auto_search_handler，上游请求全部由录制内容应答，不访问网络。
+可用于对比正则修改、缓存策略与并发配置对真实流量的影响。
+
+用法（在 AstrBot 环境中、插件目录下执行）:
+    python replay.py data/touchgal_traffic.jsonl.gz
+    python replay.py traffic.jsonl.gz --speed 10 --config override.json
+    python replay.py traffic.jsonl.gz --speed 0 --no-latency
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter, defaultdict, deque
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from main import TouchGalPlugin, load_traffic
+
+
+class TrafficReplayer:
+    """按请求键从录制内容中应答上游请求"""
+
+    def __init__(self, records: List[dict], speed: float = 1.0, latency: bool = True):
+        self.speed = speed
+        self.latency = latency
+        self._responses: Dict[str, deque] = defaultdict(deque)
+        for record in records:
+            if record.get("type") == "upstream":
+                self._responses[record["key"]].append(record)
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+
+    async def respond(self, endpoint: str, key: str) -> Tuple[int, str]:
+        responses = self._responses.get(key)
+        if not responses:
+            self.misses[endpoint] += 1
+            return 0, ""
+
+        # 同一请求录制了多次时按顺序应答，最后一条重复使用
+        record = responses.popleft() if len(responses) > 1 else responses[0]
+        self.hits[endpoint] += 1
+
+        if self.latency and self.speed > 0:
+            await asyncio.sleep(record.get("elapsed", 0) / self.speed)
+        if record.get("error") == "timeout":
+            raise asyncio.TimeoutError()
+        return record.get("status") or 0, record.get("body", "")
+
+
+class ReplayEvent:
+    """模拟 AstrMessageEvent 的最小实现，收集插件的回复"""
+
+    def __init__(self, record: dict):
+        group_id = record.get("group", "replay")
+        self.message_str = record.get("text", "")
+        self.message_obj = SimpleNamespace(group_id=group_id, raw_message=None)
+        self.unified_msg_origin = f"replay:GroupMessage:{group_id}"
+        self.platform_name = "replay"
+        self.replies: List[str] = []
+        self.stopped = False
+        self._extras: dict = {}
+
+    def plain_result(self, text: str) -> str:
+        return text
+
+    def chain_result(self, chain) -> str:
+        return str(chain)
+
+    async def send(self, result):
+        self.replies.append(result)
+
+    def stop_event(self):
+        self.stopped = True
+
+    def get_self_id(self) -> str:
+        return "10000"
+
+    def set_extra(self, key: str, value):
+        self._extras[key] = value
+
+    def get_extra(self, key: str, default=None):
+        return self._extras.get(key, default)
+
+
+def build_config(override_path: Optional[str]) -> dict:
+    """以 _conf_schema.json 的默认值为基础生成回放配置"""
+    schema_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "_conf_schema.json"
+    )
+    with open(schema_path, encoding="utf-8") as f:
+        schema = json.load(f)
+    config = {key: item.get("default") for key, item in schema.items()}
+
+    if override_path:
+        with open(override_path, encoding="utf-8") as f:
+            config.update(json.load(f))
+
+    # 回放时始终启用自动搜索，群号已做哈希处理，不再过滤；也不再重复录制
+    config["auto_search_enabled"] = True
+    config["auto_search_group_list"] = []
+    config["traffic_record_enabled"] = False
+    # 别名索引来自线上的用户选择，回放时不读写，避免结果受本地索引影响
+    config["alias_index_enabled"] = False
+    return config
+
+
+async def replay_message(plugin: TouchGalPlugin, record: dict) -> dict:
+    event = ReplayEvent(record)
+    start = time.monotonic()
+    async for result in plugin.auto_search_handler(event):
+        event.replies.append(result)
+    return {
+        "record": record,
+        # 使用处理器本次提取的关键词，避免重复提取影响卸载统计
+        "keyword": event.get_extra("touchgal_keyword"),
+        "replied": event.stopped,
+        "elapsed": time.monotonic() - start,
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def run(args):
+    records = load_traffic(args.file)
+    messages = [r for r in records if r.get("type") == "message"]
+    if not messages:
+        print("录制文件中没有消息记录。")
+        return
+
+    plugin = TouchGalPlugin(None, build_config(args.config))
+    replayer = TrafficReplayer(records, speed=args.speed, latency=not args.no_latency)
+    plugin.traffic_replay = replayer
+    await plugin.initialize()
+
+    # 按录制时间间隔（除以加速倍率）投递消息，保留原始的并发形态
+    loop = asyncio.get_running_loop()
+    base_ts = messages[0].get("ts", 0)
+    started = loop.time()
+    tasks = []
+    for record in messages:
+        if args.speed > 0:
+            delay = (record.get("ts", base_ts) - base_ts) / args.speed
+            wait = delay - (loop.time() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        tasks.append(asyncio.create_task(replay_message(plugin, record)))
+    results = await asyncio.gather(*tasks)
+    total_time = loop.time() - started
+    await plugin.terminate()
+
+    # ========== 汇总报告 ==========
+    changed = [r for r in results if r["keyword"] != r["record"].get("keyword")]
+    latencies = [r["elapsed"] for r in results]
+    queue_stats = plugin.auto_search_queue.stats()
+    lag_stats = plugin.loop_lag.stats()
+
+    print(
+        f"回放消息: {len(results)} 条 | 总耗时: {total_time:.2f}s | 加速倍率: {args.speed or '不限'}"
+    )
+    print(f"产生回复: {sum(1 for r in results if r['replied'])} 条")
+    print(
+        f"处理耗时: p50={percentile(latencies, 50):.3f}s "
+        f"p95={percentile(latencies, 95):.3f}s max={max(latencies):.3f}s"
+    )
+    print(
+        f"准入队列: 接收 {queue_stats['accepted']} | 完成 {queue_stats['completed']} | 失败 {queue_stats['failed']} | 丢弃 {queue_stats['shed_total']}"
+    )
+    if lag_stats["samples"]:
+        print(
+            f"事件循环延迟: p99={lag_stats['p99'] * 1000:.1f}ms max={lag_stats['max'] * 1000:.1f}ms"
+        )
+    for endpoint in sorted(set(replayer.hits) | set(replayer.misses)):
+        print(
+            f"上游 {endpoint}: 命中 {replayer.hits[endpoint]} | 未录制 {replayer.misses[endpoint]}"
+        )
+
+    print(f"关键词变化: {len(changed)} 条")
+    for r in changed[: args.show]:
+        print(
+            f"  {r['record'].get('text', '')[:40]!r}: {r['record'].get('keyword')!r} -> {r['keyword']!r}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回放 TouchGal 插件录制的流量")
+    parser.add_argument("file", help="录制文件路径（.jsonl.gz）")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="回放加速倍率，0 表示不等待、尽快回放"
+    )
+    parser.add_argument("--config", help="覆盖插件配置的 JSON 文件")
+    parser.add_argument(
+        "--no-latency", action="store_true", help="不模拟录制时的上游响应耗时"
+    )
+    parser.add_argument("--show", type=int, default=10, help="显示的关键词变化条数")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()